@@ -13,7 +13,8 @@ PID = 0
 if __name__ == '__main__':
     devices = Enumeration(vid=VID, pid=PID)
     for device in devices.find():
-        device.open()
+        # All of these fields come straight off the enumeration record, so there is no need to open (and slowly
+        # close) every device just to print them.
         info = f"Device: vid/pid: {device.vendor_id}/{device.product_id}\n" \
                f"  path:          {device.path}\n" \
                f"  serial_number: {device.serial_number}\n" \
@@ -21,5 +22,4 @@ if __name__ == '__main__':
                f"  usage:         {device.usage}\n" \
                f"  Manufacturer:  {device.manufacturer_string}\n" \
                f"  Product:       {device.product_string}"
-        print(info)
-        device.close()
\ No newline at end of file
+        print(info)
\ No newline at end of file
@@ -2,6 +2,8 @@ from lighting import CombiningScheme, CombineType, Mask
 
 
 class Layer:
+    __slots__ = ('scheme_getter', 'combine_type', 'mask')
+
     def __init__(self, scheme_getter, combine_type: CombineType = CombineType.Overlay,
                  mask: Mask = Mask.ALL):
         """
@@ -49,6 +51,7 @@ class ConfigMeta(type):
                     layers[elem] = value
 
         new_cls.__layers__ = list(layers.values())
+        new_cls.__scheme_cache__ = None
 
         return new_cls
 
@@ -68,10 +71,13 @@ class Config(metaclass=ConfigMeta):
     """
 
     def get_scheme(self) -> CombiningScheme:
-        if not hasattr(self, "scheme"):
-            self.scheme = CombiningScheme()
+        cls = type(self)
+        if cls.__scheme_cache__ is None:
+            scheme = CombiningScheme()
 
             for l in self.__layers__:
-                self.scheme.add_scheme(l.scheme_getter(self), l.combine_type, l.mask)
+                scheme.add_scheme(l.scheme_getter(self), l.combine_type, l.mask)
+
+            cls.__scheme_cache__ = scheme
 
-        return self.scheme
+        return cls.__scheme_cache__
@@ -1,61 +1,60 @@
 import configs as config
-from lighting import key_grid_by_col, GradientKeyPoint, Color, Gradient, CombineType, Mask, combine_keys_and_functions, \
+from lighting import GRID_SHAPE, GradientKeyPoint, Color, Gradient, CombineType, Mask, combine_keys_and_functions, \
     column_gradient, NoisePalette, FunctionScheme, NoiseScheme, ReactiveScheme, SolidColorScheme
-import numpy as np
+
+# The gradients and palettes below are constant, so they're built once at import and shared by every FSBPConfig
+# instance (and anything else that wants the same palettes).
+_flame_base_gradient = Gradient([
+    GradientKeyPoint(Color(255, 175, 0), 1),
+    GradientKeyPoint(Color(255, 0, 0), 0),
+], True)
+
+_flame_flicker_palette = NoisePalette(Gradient([
+    GradientKeyPoint(Color(0, 0, 0), 0),
+    GradientKeyPoint(Color(127, 127, 127), 1)
+]), speed=0.1)
+
+_flame_dampen_gradient = Gradient([
+    GradientKeyPoint(Color(180, 180, 180), 0),
+    GradientKeyPoint(Color(130, 130, 175), 0.1),
+    GradientKeyPoint(Color(0, 0, 0), 1)
+])
+
+_starlight_chance = 0.125
+_starlight_palette = NoisePalette(Gradient([
+    GradientKeyPoint(Color(0, 0, 0), 0),
+    GradientKeyPoint(Color(0, 0, 0), 1 - _starlight_chance),
+    GradientKeyPoint(Color(100, 25, 127), 1 - _starlight_chance),
+    GradientKeyPoint(Color(200, 50, 255), 1)
+]), speed=0.05, scale=115)
 
 
 class FSBPConfig(config.Config):
     def __init__(self):
         super().__init__()
-        self.shape = np.shape(key_grid_by_col)
+        self.shape = GRID_SHAPE
 
     @config.layer()
     def flame_base(self):
-        flame_base_colors = [
-            GradientKeyPoint(Color(255, 175, 0), 1),
-            GradientKeyPoint(Color(255, 0, 0), 0),
-        ]
-        flame_base_gradient = Gradient(flame_base_colors, True)
         flame_base_scheme = FunctionScheme(
-            combine_keys_and_functions(column_gradient(self.shape[0], self.shape[1], flame_base_gradient)))
+            combine_keys_and_functions(column_gradient(self.shape[0], self.shape[1], _flame_base_gradient)))
 
         return flame_base_scheme
 
     @config.layer(combine_type=CombineType.Subtract)
     def flame_flicker(self):
-        flame_flicker_colors = [
-            GradientKeyPoint(Color(0, 0, 0), 0),
-            GradientKeyPoint(Color(127, 127, 127), 1)
-        ]
-        flame_flicker_palette = NoisePalette(Gradient(flame_flicker_colors), speed=0.1)
-        flame_flicker_scheme = NoiseScheme(flame_flicker_palette)
-
-        return flame_flicker_scheme
+        return NoiseScheme(_flame_flicker_palette)
 
     @config.layer(combine_type=CombineType.Subtract)
     def flame_dampen(self):
-        flame_dampen_colors = [
-            GradientKeyPoint(Color(180, 180, 180), 0),
-            GradientKeyPoint(Color(130, 130, 175), 0.1),
-            GradientKeyPoint(Color(0, 0, 0), 1)
-        ]
-        flame_dampen_gradient = Gradient(flame_dampen_colors)
         flame_dampen_scheme = FunctionScheme(
-            combine_keys_and_functions(column_gradient(self.shape[0], self.shape[1], flame_dampen_gradient)))
+            combine_keys_and_functions(column_gradient(self.shape[0], self.shape[1], _flame_dampen_gradient)))
 
         return flame_dampen_scheme
 
     @config.layer(mask=Mask.FUNCTION + ['Space'])
     def starlight(self):
-        starlight_chance = 0.125
-
-        starlight_colors = [
-            GradientKeyPoint(Color(0, 0, 0), 0),
-            GradientKeyPoint(Color(0, 0, 0), 1 - starlight_chance),
-            GradientKeyPoint(Color(100, 25, 127), 1 - starlight_chance),
-            GradientKeyPoint(Color(200, 50, 255), 1)
-        ]
-        return NoiseScheme(NoisePalette(Gradient(starlight_colors), speed=0.05, scale=115))
+        return NoiseScheme(_starlight_palette)
 
     @config.layer()
     def reactive_blue(self):
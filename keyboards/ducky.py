@@ -1,8 +1,9 @@
 from keyboards import PacketStream, Packet, RGBKeyboard, KeyColorManager, KeyData
-from typing import List
 from lighting import Color
 import asyncio
 
+import numpy as np
+
 DUCKY_ONE_2_VID = 0x04d9
 DUCKY_ONE_2_PID = 0 # 0x0348
 DUCKY_ONE_2_USAGE_PAGE = 0xff00
@@ -14,6 +15,16 @@ class DuckyOne2RGBColorManager(KeyColorManager):
     This KeyColorManager is specialized for the Ducky One2 RGB, 108-key US layout.
     """
 
+    # The packet headers never change for this keyboard model, so they're built once as a class-level
+    # template and copied at the start of every packets_to_send call.
+    _HEADERS = np.zeros((8, 64), dtype=np.uint8)
+    _HEADERS[:, 0] = 0x56
+    _HEADERS[:, 1] = 0x42
+    _HEADERS[:, 4] = 0x02
+    _HEADERS[:7, 5] = 0x12
+    _HEADERS[7, 5] = 0x06
+    _HEADERS[:, 6] = 18 * np.arange(8)
+
     def _setup_keys(self):
         self.keys["Escape"] = KeyData(Color(0, 0, 0), 0, 0x08)
         self.keys["SectionSign"] = KeyData(Color(0, 0, 0), 0, 0x0b)
@@ -162,41 +173,35 @@ class DuckyOne2RGBColorManager(KeyColorManager):
         # 7 0x14
         self.keys["RightEnter"] = KeyData(Color(0, 0, 0), 7, 0x17)
 
+        # The packet layout above is static, so precompute it structure-of-arrays style: for every key, the
+        # packet and offset of each of its three color bytes (accounting for colors that straddle a packet
+        # boundary). packets_to_send can then scatter all the colors with one fancy-indexed store instead of
+        # a Python loop over every key and channel.
+        packet_numbers = np.array([key.packet_number for key in self.keys.values()], dtype=np.intp)
+        offsets = np.array([key.offset for key in self.keys.values()], dtype=np.intp)
+        rgb_offsets = offsets[:, None] + np.arange(3)
+        self._scatter_packets = packet_numbers[:, None] + (rgb_offsets >= 64)
+        self._scatter_offsets = np.where(rgb_offsets >= 64, rgb_offsets - 60, rgb_offsets)
+
+        # Persistent packet storage: one flat bytearray backs both the numpy scatter view and the Packets'
+        # per-row memoryviews. Scattering colors through the array rewrites the outgoing bytes in place, so
+        # packets_to_send allocates nothing per frame. The header and padding bytes are seeded once and
+        # never change.
+        backing = bytearray(self._HEADERS.nbytes)
+        self._packet_buf = np.frombuffer(backing, dtype=np.uint8).reshape(self._HEADERS.shape)
+        self._packet_buf[:] = self._HEADERS
+        view = memoryview(backing)
+        # The keyboard doesn't handshake per color packet - the old all-zero inbound packets paired with
+        # each outbound one just blocked on a read that almost never matched. Sending the 8 outbound
+        # packets back-to-back halves the HID transactions per refresh.
+        self._packet_stream = PacketStream(packets=[
+            Packet(True, view[i * 64:(i + 1) * 64], 0x1) for i in range(self._HEADERS.shape[0])])
+
     def packets_to_send(self) -> PacketStream:
-        data_arrays: List[bytearray] = []
-        packets: List[Packet] = []
-
-        # ------------------------------------------ Apply packet metadata ------------------------------------------- #
-        for i in range(8):
-            data = bytearray(64)
-            data[0] = 0x56
-            data[1] = 0x42
-            data[4] = 0x02
-            if i == 7:
-                data[5] = 0x06
-            else:
-                data[5] = 0x12
-            data[6] = 18 * i
-            data_arrays.append(data)
-
-        # ---------------------------------------------- Apply key data ---------------------------------------------- #
-        for name, key in self.keys.items():
-            offsets = [key.offset + x for x in range(3)]
-
-            for offset, color_byte in zip(offsets, key.color):
-                packet = key.packet_number
-                if offset >= 64:
-                    offset -= 60
-                    packet += 1
-
-                data_arrays[packet][offset] = color_byte
-
-        # -------------------------------------------- Initialize packets -------------------------------------------- #
-        for data in data_arrays:
-            packets.append(Packet(True, data, 0x1))
-            packets.append(Packet(False, bytearray([0] * 64), 0x1))  # Allow for waiting for response
-
-        return PacketStream(packets=packets)
+        # One fancy-indexed store pushes the manager's whole color block straight into the bytes the
+        # stream's Packets view, so there is nothing to gather, copy, or wrap.
+        self._packet_buf[self._scatter_packets, self._scatter_offsets] = self._colors
+        return self._packet_stream
 
 
 class DuckyOne2RGB(RGBKeyboard):
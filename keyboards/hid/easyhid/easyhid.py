@@ -7,6 +7,7 @@
 
 import cffi
 import ctypes.util
+import time
 
 ffi = cffi.FFI()
 ffi.cdef("""
@@ -403,12 +404,25 @@ class Enumeration(object):
         return result
 
 
+# Walking the USB bus is slow (hundreds of ms with many devices), so recent enumerations are cached per
+# (vid, pid) for a short window. Repeated Enumeration construction within that window reuses the last walk.
+_ENUM_CACHE = {}
+_ENUM_CACHE_SECONDS = 2.0
+
+
 def _hid_enumerate(vendor_id=0, product_id=0):
     """
     Enumerates all the hid devices for VID:PID. Returns a list of `HIDDevice`
     objects.  If vid is 0, then match any vendor id. Similarly, if pid is 0,
     match any product id. If both are zero, enumerate all HID devices.
+
+    Results are cached for _ENUM_CACHE_SECONDS so back-to-back enumerations
+    don't re-walk the bus.
     """
+    cached = _ENUM_CACHE.get((vendor_id, product_id))
+    if cached is not None and time.monotonic() - cached[0] < _ENUM_CACHE_SECONDS:
+        return cached[1]
+
     start = hidapi.hid_enumerate(vendor_id, product_id)
     result = []
     cur = ffi.new("struct hid_device_info*")
@@ -422,4 +436,6 @@ def _hid_enumerate(vendor_id=0, product_id=0):
     # Free the C memory
     hidapi.hid_free_enumeration(start)
 
+    _ENUM_CACHE[(vendor_id, product_id)] = (time.monotonic(), result)
+
     return result
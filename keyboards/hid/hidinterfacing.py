@@ -38,6 +38,14 @@ class Packet:
                and o.data == self.data \
                and o.report_id == self.report_id
 
+    def matches_received(self, raw: bytearray) -> bool:
+        """
+        Checks raw data read from a HID against this (inbound) Packet. The first byte of raw is assumed to be the
+        report id. Equivalent to building a Packet from raw and comparing with ==, without the throwaway
+        allocation and data copy.
+        """
+        return not self.outbound and self.report_id == raw[0] and memoryview(raw)[1:] == self.data
+
     @classmethod
     def build_packet(cls, direction: str, data_string: str):
         """
@@ -67,12 +75,17 @@ class PacketStream:
         packets = []
 
         with open(file_path, 'r') as file:
-            for line in file:
-                if line != "":
-                    direction = line[0]
-                    if direction in ("I", "O"):
-                        data_string = line[2:-1]
-                        packets.append(Packet.build_packet(direction, data_string))
+            lines = [line for line in file.read().splitlines() if line[:1] in ("I", "O")]
+
+        # Parse all the hex payloads with a single fromhex call instead of one small parse (and two bytearray
+        # copies) per line. Each Packet gets a zero-copy memoryview into the shared buffer.
+        joined = memoryview(bytearray.fromhex("".join(line[2:] for line in lines)))
+
+        offset = 0
+        for line in lines:
+            length = (len(line) - 2) // 2
+            packets.append(Packet(line[0] == "O", joined[offset + 1:offset + length], joined[offset]))
+            offset += length
 
         print(f"PacketStream {file_path} parsed correctly.")
         logging.info(f"PacketStream {file_path} parsed correctly.")
@@ -141,9 +154,10 @@ class HIDHandler:
         #       f"  Manufacturer:  {self.device.manufacturer_string}\n"
         #       f"  Product:       {self.device.product_string}")
 
-    async def send(self, bytes_to_send: bytearray, report_id: int) -> int:
+    def send(self, bytes_to_send: bytearray, report_id: int) -> int:
         """
-        Sends data to the HID.
+        Sends data to the HID. hidapi's write is blocking C, so this is a plain function - wrapping it in a
+        coroutine only added an event-loop round-trip per packet.
 
         :param bytes_to_send: a bytearray of the data to send
         :param report_id: the report id of the data to send
@@ -157,7 +171,7 @@ class HIDHandler:
             print(f"Error sending packet: {bytes_to_send}")
             raise e
 
-    async def recv(self, length: int = 64) -> bytearray:
+    def recv(self, length: int = 64) -> bytearray:
         """
         Waits for data to be sent from the HID.
 
@@ -221,7 +235,7 @@ class PacketSender:
         :return: True if the execution is determined to have been successful
         """
         if packet.outbound:
-            return await self.handler.send(packet.data, packet.report_id) - 1 == len(packet.data)
+            return self.handler.send(packet.data, packet.report_id) - 1 == len(packet.data)
         else:
-            returned_data = await self.handler.recv()
-            return packet == Packet(False, returned_data[1:], returned_data[0])
+            returned_data = self.handler.recv()
+            return packet.matches_received(returned_data)
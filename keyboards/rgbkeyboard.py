@@ -2,14 +2,15 @@ import asyncio
 import traceback
 
 from keyboards import HIDHandler, PacketSender, PacketStream
-from abc import ABC, abstractmethod
 from lighting import Color, Mask, LightingScheme, CombiningScheme, CombineType, HookingScheme
 from configs import Config
 
-from typing import Dict, List, Callable, Optional
+from typing import Dict, List, Callable, Optional, Tuple
 import keyboard
 import logging
 
+import numpy as np
+
 
 class KeyData:
     def __init__(self, color: Color, packet_number: int, offset: int):
@@ -21,12 +22,27 @@ class KeyData:
         :param packet_number: the packet this key's data starts in
         :param offset: the offset in the packet this key's data starts in
         """
+        self._color = np.zeros(3, dtype=np.uint8)
         self.color = color
         self.packet_number = packet_number
         self.offset = offset
 
+    @property
+    def color(self) -> np.ndarray:
+        """
+        The key's color, quantized to the (3,) uint8 array the HID wire format wants - reading it never pays
+        for per-channel Color attribute access.
+        """
+        return self._color
+
+    @color.setter
+    def color(self, color) -> None:
+        # In-place write: after setup the manager rebinds _color to a row of its shared color block, so
+        # single-key updates land in the same memory the packet builders read.
+        self._color[:] = color.v if isinstance(color, Color) else color
 
-class KeyColorManager(ABC):
+
+class KeyColorManager:
     def __init__(self):
         """
         A KeyColorManager manages active key colors and determines how that information should be encoded into packets
@@ -36,8 +52,16 @@ class KeyColorManager(ABC):
         """
         self.keys: Dict[str, KeyData] = {}
         self._setup_keys()
+        # The key set is fixed after setup, so freeze the iteration order once and pack every color into one
+        # contiguous (N, 3) uint8 block. Each KeyData's color becomes a view of its row, so the per-key API
+        # and the vectorized packet builders share the same bytes.
+        self._ordered: List[KeyData] = list(self.keys.values())
+        self._key_index: Dict[str, int] = {key: i for i, key in enumerate(self.keys)}
+        self._colors = np.array([data.color for data in self._ordered], dtype=np.uint8)
+        for i, data in enumerate(self._ordered):
+            data._color = self._colors[i]
+        self._last_digest: Optional[int] = None
 
-    @abstractmethod
     def _setup_keys(self) -> None:
         """
         Used to initialize self.keys to be a Dict[str, KeyData]. Must be defined in a subclass.
@@ -48,14 +72,13 @@ class KeyColorManager(ABC):
         """
         Sets the color of a KeyData in self.keys.
         """
-        self.keys[key].color = color
+        self._colors[self._key_index[key]] = color.v if isinstance(color, Color) else color
 
     def reset_colors(self) -> None:
         """
         Resets the color of every KeyData in self.keys to black (Color(0, 0, 0)).
         """
-        for key, data in self.keys.items():
-            data.color = Color(0, 0, 0)
+        self._colors[:] = 0
 
     def apply_scheme(self, scheme: LightingScheme, mask: Mask = Mask.ALL, *args, **kwargs) -> None:
         """
@@ -65,11 +88,26 @@ class KeyColorManager(ABC):
         :param args: any additional arguments to pass into LightingScheme::get_all_colors()
         :param kwargs: any additional keyword arguments to pass into LightingScheme::get_all_colors()
         """
-        colors = scheme.get_all_colors(mask, *args, **kwargs)
-        for key, color in colors.items():
-            self.set_key_color(str(key), color)
+        # KeyIndex hashes and compares equal to its string name, so the scheme's keys index _key_index
+        # directly without a per-key str() coercion. The row assignment is set_key_color's body inlined:
+        # this loop runs for every key on every push, and a call frame per key costs more than the work
+        # inside.
+        colors = self._colors
+        index = self._key_index
+        for key, color in scheme.get_all_colors(mask, *args, **kwargs).items():
+            colors[index[key]] = color.v
+
+    def colors_changed(self) -> bool:
+        """
+        Reports whether any key color changed since this was last called. Hashing the color block is a few
+        hundred bytes of C work, far cheaper than the HID writes it lets push() skip when the lighting is
+        static.
+        """
+        digest = hash(self._colors.tobytes())
+        changed = digest != self._last_digest
+        self._last_digest = digest
+        return changed
 
-    @abstractmethod
     def packets_to_send(self) -> PacketStream:
         """
         Constructs a PacketStream that contains all the KeyData information. This gets sent to the physical keyboard by
@@ -81,7 +119,7 @@ class KeyColorManager(ABC):
         raise NotImplementedError("Must implement a way to turn self.keys into a PacketStream for sending.")
 
 
-class RGBKeyboard(HIDHandler, PacketSender, ABC):
+class RGBKeyboard(HIDHandler, PacketSender):
     def __init__(self, vid: int, pid: int, usage: int, usage_page: int, **prepared_traffic_files: str):
         """
         An RGBKeyboard declares methods and defines some default behaviors required to interface with a physical RGB
@@ -104,7 +142,7 @@ class RGBKeyboard(HIDHandler, PacketSender, ABC):
         self.color_manager: Optional[KeyColorManager] = None
         self.initialized = False
 
-        self._hooks_list: List[Callable[[keyboard.KeyboardEvent], None]] = []
+        self._hooks_list: Tuple[Callable[[keyboard.KeyboardEvent], None], ...] = ()
         keyboard.hook(self._hook_callback)
 
         self.scheme: CombiningScheme = CombiningScheme()
@@ -166,7 +204,7 @@ class RGBKeyboard(HIDHandler, PacketSender, ABC):
         Removes all layers from self.scheme.
         """
         self.scheme.clear_schemes()
-        self._hooks_list = []
+        self._hooks_list = ()
 
     def set_config(self, config: Config) -> None:
         """
@@ -187,6 +225,11 @@ class RGBKeyboard(HIDHandler, PacketSender, ABC):
             raise NotImplementedError("RGBKeyboard connection not initialized!")
 
         self.color_manager.apply_scheme(self.scheme, mask, *args, **kwargs)
+        if not self.color_manager.colors_changed():
+            # Byte-identical frame - skip the HID writes, but still yield so the event loop isn't starved
+            # by a tight push() loop that never suspends.
+            await asyncio.sleep(0)
+            return
         packet_stream = self.color_manager.packets_to_send()
         await self.execute_packet_stream(packet_stream)
 
@@ -203,16 +246,21 @@ class RGBKeyboard(HIDHandler, PacketSender, ABC):
         logging.info("Closing connection")
 
     def _add_hooks(self, *hooks: Callable[[keyboard.KeyboardEvent], None]) -> None:
-        self._hooks_list += hooks
+        self._hooks_list = self._hooks_list + hooks
         logging.info("Added hooks!")
 
     def _remove_hooks(self, *hooks: Callable[[keyboard.KeyboardEvent], None]) -> None:
-        self._hooks_list -= hooks
+        self._hooks_list = tuple(hook for hook in self._hooks_list if hook not in hooks)
         logging.info("Removed hooks!")
 
     def _hook_callback(self, event: keyboard.KeyboardEvent) -> None:
         """
         This method gets hooked to the keyboard, and calls any hooks supplied by HookingSchemes in self.scheme.
+        Replacing the tuple wholesale on add/remove keeps this dispatch safe against the keyboard library's
+        thread without a lock.
         """
-        for hook in self._hooks_list:
+        hooks = self._hooks_list
+        if not hooks:
+            return
+        for hook in hooks:
             hook(event)
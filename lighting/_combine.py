@@ -0,0 +1,50 @@
+import numpy as np
+
+# Numba is optional: when it's importable the combine kernel below is compiled to native code, otherwise an
+# equivalent NumPy implementation is used. Op codes match CombineType values.
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+_OVERLAY = 0
+_ADD = 1
+_SUBTRACT = 2
+
+
+def _combine_numpy(base: np.ndarray, new: np.ndarray, mask: np.ndarray, op_code: int) -> None:
+    if op_code == _OVERLAY:
+        apply = new.any(axis=2) & mask
+        base[apply] = new[apply]
+    else:
+        if op_code == _ADD:
+            combined = np.clip(base + new, 0, 255)
+        else:
+            combined = np.clip(base - new, 0, 255)
+        base[mask] = combined[mask]
+
+
+def _combine_loops(base, new, mask, op_code):
+    rows, cols = base.shape[0], base.shape[1]
+    for i in prange(rows):
+        for j in range(cols):
+            if not mask[i, j]:
+                continue
+            if op_code == _OVERLAY:
+                if new[i, j, 0] or new[i, j, 1] or new[i, j, 2]:
+                    for k in range(3):
+                        base[i, j, k] = new[i, j, k]
+            else:
+                for k in range(3):
+                    if op_code == _ADD:
+                        value = base[i, j, k] + new[i, j, k]
+                    else:
+                        value = base[i, j, k] - new[i, j, k]
+                    base[i, j, k] = min(max(value, 0), 255)
+
+
+if njit is not None:
+    combine_frames = njit(cache=True, fastmath=True)(_combine_loops)
+else:
+    combine_frames = _combine_numpy
@@ -1,38 +1,50 @@
 import time
-from abc import ABC, abstractmethod
+from functools import lru_cache
 from math import radians, cos, sin
 from random import random
 from typing import List, Callable, Union
 
 import keyboard
+import numpy as np
 
 from lighting import Color, Gradient, scale_map, key_codes, special_keys, Mask, KeyIndex
 
+# Optional numba, same pattern as lighting._combine: the index kernel compiles to native code when numba is
+# importable and falls back to an equivalent NumPy implementation otherwise.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
-class ColorFunction(ABC):
+# Shared "off" color for ReactiveFunction's fully decayed state. Color arithmetic never mutates in place, so
+# handing out one instance is safe and skips a Color construction per dark key per frame.
+_BLACK = Color(0, 0, 0)
+
+
+class ColorFunction:
     """
-    A ColorFunction provides a single method, get, in order to get a color.
+    A ColorFunction provides a single method, get, in order to get a color. Subclasses are instantiated per
+    key in the generator helpers below, so the contract is enforced with NotImplementedError rather than
+    ABCMeta, whose instantiation check costs real time on objects this small.
     """
 
-    @abstractmethod
     def get(self, *args, **kwargs) -> Color:
-        pass
+        raise NotImplementedError("A ColorFunction must implement get().")
 
 
-class PeriodicFunction(ColorFunction, ABC):
+class PeriodicFunction(ColorFunction):
     def __init__(self, period: float, current_time: float = 0):
         """
         A PeriodicFunction is used to get a Color that changes across a period of time and loops back to the start at the end.
         """
         self.period = period
         self.current_time = current_time
-        self.start_time = time.time() - current_time
+        self.start_time = time.perf_counter() - current_time
 
     def update_time(self):
-        self.current_time = time.time() - self.start_time
-        while self.current_time > self.period:
-            self.start_time += self.period
-            self.current_time -= self.period
+        # perf_counter is monotonic and cheaper than time.time on most platforms, and the modulo replaces the
+        # old catch-up loop (which walked one period per iteration after any long stall)
+        self.current_time = (time.perf_counter() - self.start_time) % self.period
 
 
 class SolidColor(ColorFunction):
@@ -74,6 +86,10 @@ class StaticGradient(ColorFunction):
         See the documentation for this class's get method.
         """
         self.gradient = gradient
+        # Per-instance closure rather than lru_cache on the method, which would keep every instance alive
+        # through the cache. Quantizing t to 1/1024ths makes recurring positions (per-key layouts and the
+        # like) a dict hit instead of a full interpolation; random ts just cycle through the cache.
+        self._cached_color = lru_cache(maxsize=1024)(lambda q: gradient.get_color(q / 1024.0))
 
     def __str__(self):
         return "StaticGradient[{}]".format(self.gradient)
@@ -87,75 +103,77 @@ class StaticGradient(ColorFunction):
         return self.get_color_at_t(random())
 
     def get_color_at_t(self, t: float) -> Color:
-        return self.gradient.get_color(t)
+        return self._cached_color(int(t * 1024))
 
 
 class ReactiveFunction(ColorFunction):
+    # How this function's key disambiguates events sharing a scan code, resolved once at construction
+    _NORMAL = 0
+    _RIGHT = 1
+    _NUMPAD = 2
+
     def __init__(self, lower_function: Union[ColorFunction, Callable], key: str, decay: float = 0.25):
         """
         A Reactive Function is special for a ReactiveScheme.
         """
-        if isinstance(lower_function, ColorFunction):
-            def callable_function(*args, **kwargs) -> Color:
-                return lower_function.get(*args, **kwargs)
-
-            lower_function = callable_function
         self.lower_function = lower_function
+        # Calling the bound get directly avoids the old forwarding closure - one call frame per key per
+        # frame instead of two.
+        self._lower_get = lower_function.get if isinstance(lower_function, ColorFunction) else lower_function
         self.on = False
         self.decay = decay
         self.start_time = 0
         self.key = key
 
+        # The scan code and the special-key classification are constant for this function's lifetime, so the
+        # per-event callbacks only pay one compare and one branch instead of redoing the dict and membership
+        # lookups on every key event.
+        self._scan_code = int(key_codes[key])
+        if key in special_keys["Right"]:
+            self._mode = ReactiveFunction._RIGHT
+        elif key in special_keys["Numpad"]:
+            self._mode = ReactiveFunction._NUMPAD
+        else:
+            self._mode = ReactiveFunction._NORMAL
+
         self.on_press = self._callback_on_press
         self.on_release = self._callback_on_release
 
+    def _matches(self, event: keyboard.KeyboardEvent) -> bool:
+        if event.scan_code != self._scan_code:
+            return False
+        if self._mode == ReactiveFunction._RIGHT:
+            return event.name.startswith("right") and not event.is_keypad
+        if self._mode == ReactiveFunction._NUMPAD:
+            return event.is_keypad
+        return not (event.is_keypad or event.name.startswith("right"))
+
     def _callback_on_press(self, event: keyboard.KeyboardEvent):
         """
         Turns on the lighting.
         """
-        if int(key_codes[self.key]) == int(event.scan_code):
-            if self.key in special_keys["Right"]:
-                if event.name.startswith("right") and not event.is_keypad:
-                    self.on = True
-                return
-            if self.key in special_keys["Numpad"]:
-                if event.is_keypad:
-                    self.on = True
-                return
-            if not (event.is_keypad or event.name.startswith("right")):
-                self.on = True
+        if self._matches(event):
+            self.on = True
 
     def _callback_on_release(self, event: keyboard.KeyboardEvent):
         """
         Starts the decay of the lighting.
         """
-        if int(key_codes[self.key]) == int(event.scan_code):
-            if self.key in special_keys["Right"]:
-                if event.name.startswith("right") and not event.is_keypad:
-                    self.on = False
-                    self.start_time = time.time()
-                return
-            if self.key in special_keys["Numpad"]:
-                if event.is_keypad:
-                    self.on = False
-                    self.start_time = time.time()
-                return
-            if not (event.is_keypad or event.name.startswith("right")):
-                self.on = False
-                self.start_time = time.time()
+        if self._matches(event):
+            self.on = False
+            self.start_time = time.perf_counter()
 
     def reset(self):
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
 
     def get(self, *args, **kwargs) -> Color:
-        cur_time = time.time()
         if self.on:
-            scalar = 1
-        elif cur_time - self.start_time <= self.decay:
-            scalar = scale_map(cur_time - self.start_time, 0, self.decay, 1, 0)
-        else:
-            scalar = 0
-        return self.lower_function(*args, **kwargs) * scalar
+            return self._lower_get(*args, **kwargs)
+        elapsed = time.perf_counter() - self.start_time
+        if elapsed > self.decay:
+            # Fully decayed keys (the common state) never touch the lower function at all
+            return _BLACK
+        return self._lower_get(*args, **kwargs) * scale_map(elapsed, 0, self.decay, 1, 0)
 
     def __str__(self):
         return "{} {}".format(self.key, self.lower_function)
@@ -172,6 +190,52 @@ def single_color(n: int, color: Color) -> List[SolidColor]:
     return out * n
 
 
+def _indices_numpy(width, height, cos_r, sin_r, gradient_length):
+    xs, ys = np.indices((width, height))
+    raw = np.abs(xs * cos_r - ys * sin_r)
+    return np.minimum(np.round(raw).astype(np.int64), gradient_length - 1).ravel()
+
+
+def _indices_loops(width, height, cos_r, sin_r, gradient_length):
+    out = np.empty(width * height, dtype=np.int64)
+    k = 0
+    for x in range(width):
+        for y in range(height):
+            i = int(round(abs(x * cos_r - y * sin_r)))
+            if i > gradient_length - 1:
+                i = gradient_length - 1
+            out[k] = i
+            k += 1
+    return out
+
+
+if njit is not None:
+    _compute_indices = njit(cache=True)(_indices_loops)
+else:
+    _compute_indices = _indices_numpy
+
+
+@lru_cache(maxsize=128)
+def _trig(gradient_angle: float):
+    """
+    cos/sin of the negated gradient angle, memoized per distinct angle. Right angles get exact values so the
+    index math at 0/90/180/270 stays free of float error instead of picking up cos(pi/2) ~ 6e-17.
+    """
+    if gradient_angle % 90 == 0:
+        return ((1.0, 0.0), (0.0, -1.0), (-1.0, 0.0), (0.0, 1.0))[int(gradient_angle // 90) % 4]
+    rads = radians(-gradient_angle)
+    return cos(rads), sin(rads)
+
+
+def _gradient_indices(width: int, height: int, gradient_angle: float, gradient_length: int) -> np.ndarray:
+    """
+    Computes the clamped gradient index of every (x, y) cell, flattened in the same x-outer/y-inner order the
+    generators below emit their ColorFunctions in.
+    """
+    cos_r, sin_r = _trig(gradient_angle)
+    return _compute_indices(width, height, cos_r, sin_r, gradient_length)
+
+
 def gen_solid_gradient(width: int, height: int, gradient: Gradient, gradient_length: int, gradient_angle: float = 0) -> \
         List[SolidColor]:
     """
@@ -182,28 +246,31 @@ def gen_solid_gradient(width: int, height: int, gradient: Gradient, gradient_len
     :param gradient_length: the length of the gradient (how stretched should it be)
     :param gradient_angle: a rotation angle for the grid
     """
-    rads = radians(-gradient_angle)
-    out = []
-    for x in range(0, width):
-        for y in range(0, height):
-            i = min(int(round(abs(x * cos(rads) - y * sin(rads)))), gradient_length - 1)
-            i = scale_map(i, 0, gradient_length - 1, 0, 1)
-            out.append(SolidColor(gradient.get_color(i)))
-    return out
+    # There are only gradient_length distinct indices, so evaluate the whole gradient in one vectorized call
+    # and wrap each row once; cells with the same index share the SolidColor.
+    ts = np.arange(gradient_length) / (gradient_length - 1)
+    lut = [SolidColor(Color.from_array(rgb)) for rgb in gradient.get_colors(ts)]
+    return [lut[i] for i in _gradient_indices(width, height, gradient_angle, gradient_length)]
 
 
 def column_gradient(width: int, height: int, gradient: Gradient) -> List[SolidColor]:
     """
-    An special case of gen_solid_gradient that spreads the Gradient vertically.
+    An special case of gen_solid_gradient that spreads the Gradient vertically. The color only depends on the
+    column, so the gradient is evaluated once per column rather than running the full rotation math per cell.
     """
-    return gen_solid_gradient(width, height, gradient, width, 0)
+    ts = np.arange(width) / (width - 1)
+    col_colors = [SolidColor(Color.from_array(rgb)) for rgb in gradient.get_colors(ts)]
+    return [color for color in col_colors for _ in range(height)]
 
 
 def row_gradient(width: int, height: int, gradient: Gradient) -> List[SolidColor]:
     """
-    An special case of gen_solid_gradient that spreads the Gradient horizontally.
+    An special case of gen_solid_gradient that spreads the Gradient horizontally. The color only depends on
+    the row, so the gradient is evaluated once per row and the row is repeated across the columns.
     """
-    return gen_solid_gradient(width, height, gradient, height, 90)
+    ts = np.arange(height) / (height - 1)
+    row_colors = [SolidColor(Color.from_array(rgb)) for rgb in gradient.get_colors(ts)]
+    return row_colors * width
 
 
 def uniform_periodic(n: int, gradient: Gradient, period: float) -> List[PeriodicColor]:
@@ -226,16 +293,14 @@ def periodic_gradient(width: int, height: int, gradient: Gradient, period: float
     :param gradient_angle: a rotation angle for the grid
     :param reverse_direction: reverses the direction the gradient seems to move in
     """
-    rads = radians(-gradient_angle)
-    out = []
-    for x in range(0, width):
-        for y in range(0, height):
-            i = min(int(round(abs(x * cos(rads) - y * sin(rads)))), gradient_length - 1)
-            i = scale_map(i, 0, gradient_length - 1, 0, period)
-            if reverse_direction:
-                i = period - i
-            out.append(PeriodicColor(gradient, period, i))
-    return out
+    # Like gen_solid_gradient, precompute the start time for each of the gradient_length distinct indices.
+    # Cells with the same index always show the same color, so they share one PeriodicColor per phase bucket
+    # instead of each carrying their own clock.
+    phases = [k * period / (gradient_length - 1) for k in range(gradient_length)]
+    if reverse_direction:
+        phases = [period - t for t in phases]
+    pool = [PeriodicColor(gradient, period, t) for t in phases]
+    return [pool[i] for i in _gradient_indices(width, height, gradient_angle, gradient_length)]
 
 
 def combine_keys_and_functions(functions: List[ColorFunction]):
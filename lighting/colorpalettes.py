@@ -26,6 +26,14 @@ class NoisePalette:
     def get_color(self, proportion: float) -> Color:
         return self.color_palette.get_color(proportion)
 
+    def get_colors(self, proportions: np.ndarray) -> np.ndarray:
+        """
+        Gets the Colors for a whole array of noise values at once, as an (N, 3) uint8 ndarray. This is the
+        preferred way for a NoiseScheme to evaluate a frame - one vectorized Gradient call instead of one
+        get_color per key.
+        """
+        return self.color_palette.get_colors(np.ravel(proportions))
+
 
 class WordPalette:
 
@@ -40,12 +48,16 @@ class WordPalette:
         self.functions = color_functions
         self.map = letters.from_string(word)
         self.step_time = step_time
-        self.start_time = time.time()
+        self.start_time = time.perf_counter()
+        # There are only map.shape[0] distinct roll positions, so build them all once here - np.roll
+        # allocated a fresh copy of the whole map on every call otherwise
+        self._rolled = [np.roll(self.map, -steps, axis=0) for steps in range(self.map.shape[0])]
 
     def get_rolled_map(self) -> np.ndarray:
         """
-        Determines the position of the map after having moved for some time since starting.
+        Determines the position of the map after having moved for some time since starting. The returned
+        array is shared and must be treated as read-only.
         """
-        current_time = time.time() - self.start_time
+        current_time = time.perf_counter() - self.start_time
         steps = int((current_time / self.step_time) % self.map.shape[0])
-        return np.roll(self.map, -steps, axis=0)
+        return self._rolled[steps]
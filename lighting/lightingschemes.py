@@ -1,4 +1,3 @@
-from abc import ABC, abstractmethod
 from random import getrandbits
 from typing import Dict, List, Tuple, Callable
 
@@ -7,11 +6,11 @@ import numpy as np
 from noise import snoise3
 
 from lighting import ColorFunction, ReactiveFunction, combine_keys_and_functions, single_color, NoisePalette, \
-    WordPalette, SpectrogramGenerator, key_grid_by_row, key_grid_by_col, Color, KeyIndex, scale_map, flatten, \
-    CombineType, Mask
+    WordPalette, SpectrogramGenerator, key_grid_by_row, key_grid_by_col, Color, ColorFrame, KeyIndex, scale_map, \
+    flatten, CombineType, Mask
 
 
-class LightingScheme(ABC):
+class LightingScheme:
     def __init__(self, row_major: bool = False):
         """
         A LightingScheme provides a Ducky instance with Colors according to pairs of KeyIndex-ColorFunction pairs.
@@ -27,12 +26,11 @@ class LightingScheme(ABC):
         self.row_major = row_major
         pass
 
-    @abstractmethod
     def get_color(self, key: KeyIndex, *args, **kwargs) -> Color:
         """
         Gets the Color of a single key. Additional args and kwargs can be passed, if used by the LightingScheme.
         """
-        pass
+        raise NotImplementedError("A LightingScheme must implement get_color().")
 
     def update(self, *args, **kwargs) -> None:
         """
@@ -130,6 +128,25 @@ class NoiseScheme(LightingScheme):
     def get_color(self, key: KeyIndex, *args, **kwargs) -> Color:
         return self.palette.get_color(self.noise[key[0]][key[1]])
 
+    def get_all_colors(self, mask: Mask = Mask.ALL, *args, **kwargs) -> Dict[KeyIndex, Color]:
+        """
+        Gets the Color for every key in mask. The whole noise grid goes through the palette in one vectorized
+        call; noise is shaped like the key grid, so its raveled order matches the flattened key order.
+        """
+        self.update(*args, **kwargs)
+        keys = flatten(key_grid_by_row) if self.row_major else flatten(key_grid_by_col)
+        colors = self.palette.get_colors(self.noise)
+        out = {}
+        for key, rgb in zip(keys, colors):
+            if key is not None:
+                index = KeyIndex(key, self.row_major)
+                if key not in mask:
+                    out[index] = Color(0, 0, 0)
+                else:
+                    out[index] = Color.from_array(rgb)
+
+        return out
+
 
 class WordScheme(FunctionScheme):
     def __init__(self, palette: WordPalette):
@@ -181,7 +198,7 @@ class SpectrogramScheme(FunctionScheme):
         return Color(0, 0, 0)
 
 
-class HookingScheme(LightingScheme, ABC):
+class HookingScheme(LightingScheme):
     def __init__(self, mask: Mask = Mask.ALL, row_major: bool = False, *args, **kwargs):
         """
         A HookingScheme has unique behavior from other LightingSchemes in that it has unique behavior when keys are
@@ -197,10 +214,9 @@ class HookingScheme(LightingScheme, ABC):
         self.color_functions: Dict[KeyIndex, ColorFunction] = functions
         self.hook = hook
 
-    @abstractmethod
     def _setup_hooks(self, *args, **kwargs) -> Tuple[
         Dict[KeyIndex, ColorFunction], Callable[[keyboard.KeyboardEvent], None]]:
-        pass
+        raise NotImplementedError("A HookingScheme must implement _setup_hooks().")
 
 
 class ReactiveScheme(HookingScheme):
@@ -222,17 +238,30 @@ class ReactiveScheme(HookingScheme):
         scheme = kwargs["base_scheme"]
         decay = kwargs["decay"]
 
+        by_scan_code: Dict[int, List[ReactiveFunction]] = {}
         for key in self.mask:
-            def callable_get_color(*args__, **kwargs__):
-                return scheme.get_color(KeyIndex(key, False), *args__, **kwargs__)
+            index = KeyIndex(key, False)
+
+            # index is bound as a default so each closure keeps its own key - a plain reference here would
+            # leave every function looking up the last key of the loop
+            def callable_get_color(*args__, _index=index, **kwargs__):
+                return scheme.get_color(_index, *args__, **kwargs__)
 
-            functions[KeyIndex(key, False)] = (ReactiveFunction(callable_get_color, key, decay))
+            function = ReactiveFunction(callable_get_color, key, decay)
+            functions[index] = function
+            by_scan_code.setdefault(function._scan_code, []).append(function)
 
         def callback(event: keyboard.KeyboardEvent):
-            for function in functions.values():
-                if event.event_type == keyboard.KEY_DOWN:
+            # Hashed dispatch: only the few functions sharing the event's scan code see it, instead of
+            # broadcasting every event to every key's function.
+            targets = by_scan_code.get(event.scan_code)
+            if targets is None:
+                return
+            if event.event_type == keyboard.KEY_DOWN:
+                for function in targets:
                     function.on_press(event)
-                else:
+            else:
+                for function in targets:
                     function.on_release(event)
 
         return functions, callback
@@ -257,6 +286,23 @@ class CombiningScheme(LightingScheme):
                 self.hooks += scheme.hooks
         self.schemes: List[Tuple[LightingScheme, CombineType, Mask]] = list(schemes)
 
+        if row_major:
+            grid = key_grid_by_row
+        else:
+            grid = key_grid_by_col
+        self._shape = (len(grid), len(grid[0]))
+        self._indexed_keys: List[Tuple[str, KeyIndex, Tuple[int, int]]] = \
+            [(key, KeyIndex(key, row_major), (i, j))
+             for i, sub in enumerate(grid) for j, key in enumerate(sub) if key is not None]
+
+        # Persistent combining state: the key set never changes, so the frames and the result dict are built
+        # once. The Colors in _out are views into _frame's buffer (ColorFrame.get_color shares memory), so
+        # writing the frame updates the dict for free and get_all_colors allocates nothing per call.
+        self._frame = ColorFrame(self._shape)
+        self._layer = ColorFrame(self._shape)
+        self._out: Dict[KeyIndex, Color] = \
+            {index: self._frame.get_color(position) for name, index, position in self._indexed_keys}
+
     def add_scheme(self, scheme: LightingScheme, combine_type: CombineType = CombineType.Overlay,
                    mask: Mask = Mask.ALL):
         self.schemes.append((scheme, combine_type, mask))
@@ -298,3 +344,30 @@ class CombiningScheme(LightingScheme):
                     out = out - scheme.get_color(key, *args, **kwargs)
 
         return out
+
+    def get_all_colors(self, mask: Mask = Mask.ALL, *args, **kwargs) -> Dict[KeyIndex, Color]:
+        """
+        Gets the Color for every key in mask. Layers are combined as whole ColorFrames, so each CombineType is
+        applied as a single NumPy op per layer instead of per key. The returned dict (and the Colors in it)
+        is reused across calls - treat it as read-only, valid until the next call.
+        """
+        self.update(*args, **kwargs)
+        frame = self._frame
+        layer = self._layer
+        frame.zero_out()
+        for scheme, combine_type, layer_mask in self.schemes:
+            layer.zero_out()
+            for name, index, position in self._indexed_keys:
+                if name in layer_mask:
+                    layer.buf[position] = scheme.get_color(index, *args, **kwargs).v
+            frame.combine(layer, combine_type)
+
+        if isinstance(mask, Mask) and not self.row_major:
+            # Zero everything outside the push mask in one indexed store instead of checking each key.
+            frame.buf[~mask._bool] = 0
+        else:
+            for name, index, position in self._indexed_keys:
+                if name not in mask:
+                    frame.buf[position] = 0
+
+        return self._out
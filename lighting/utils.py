@@ -1,10 +1,15 @@
 import colorsys
+import sys
 from enum import Enum
+from functools import lru_cache
 from itertools import chain
+from types import MappingProxyType
 from typing import List, Tuple, Union
 
 import numpy as np
 
+from lighting._combine import combine_frames
+
 # keyboard package key codes
 key_codes = {
     "Escape": 0x01, "F1": 0x3b, "F2": 0x3c, "F3": 0x3d, "F4": 0x3e, "F5": 0x3f, "F6": 0x40, "F7": 0x41, "F8": 0x42,
@@ -25,11 +30,15 @@ key_codes = {
     "RightEnter": 28
 }
 
+# Key names are interned so dict probes compare them by identity, and the mappings are frozen behind
+# MappingProxyType since nothing should ever mutate them.
+key_codes = MappingProxyType({sys.intern(key): code for key, code in key_codes.items()})
+
 # keyboard package special keys
-special_keys = {
-    "Numpad": ["Divide", "Multiply", "NumLock", "N1", "N2", "N3", "N4", "N5", "N6", "N7", "N8", "N9", "N0", "NDelete"],
-    "Right": ["RightAlt", "RightControl", "RightEnter", "RightWindows", "RightArrow"]
-}
+special_keys = MappingProxyType({
+    "Numpad": ("Divide", "Multiply", "NumLock", "N1", "N2", "N3", "N4", "N5", "N6", "N7", "N8", "N9", "N0", "NDelete"),
+    "Right": ("RightAlt", "RightControl", "RightEnter", "RightWindows", "RightArrow")
+})
 
 # Separated by rows, (0, 0) is top left
 key_grid_by_row = [
@@ -47,9 +56,22 @@ key_grid_by_row = [
     ["LeftControl", "LeftWindows", "LeftAlt", None, None, None, "Space", None, None, None, "RightAlt", "RightWindows",
      "Function", "RightControl", "LeftArrow", "DownArrow", "RightArrow", "N0", None, "NDelete", "RightEnter"]
 ]
+key_grid_by_row = [[sys.intern(key) if key is not None else None for key in sub] for sub in key_grid_by_row]
+
+# Separated by columns, (0, 0) is bottom left. Equivalent to np.rot90(key_grid_by_row, k=-1), without the detour
+# through an object-dtype ndarray.
+key_grid_by_col: List[List[str]] = [list(sub) for sub in zip(*key_grid_by_row[::-1])]
+
+# Precomputed name -> position lookups for both grid orientations, so str_key_to_tuple is a single dict hit
+# instead of a scan over the whole grid.
+_name_to_rc = {key: (i, j) for i, sub in enumerate(key_grid_by_row) for j, key in enumerate(sub) if key is not None}
+_name_to_cr = {key: (i, j) for i, sub in enumerate(key_grid_by_col) for j, key in enumerate(sub) if key is not None}
 
-# Separated by columns, (0, 0) is bottom left
-key_grid_by_col: List[List[str]] = list(list(sub) for sub in np.rot90(key_grid_by_row, k=-1))
+# Every real key name, flattened once at import. Reused by Mask.ALL and anywhere a full-keyboard iteration is needed.
+_ALL_KEYS = tuple(key for sub in key_grid_by_row for key in sub if key is not None)
+
+# The (cols, rows) shape of key_grid_by_col, so callers don't have to run shape inference on the grid lists.
+GRID_SHAPE = (len(key_grid_by_col), len(key_grid_by_col[0]))
 
 
 class CombineType(Enum):
@@ -87,19 +109,50 @@ def scale_map(x: float, in_min: float, in_max: float, out_min: float, out_max: f
     return (x - in_min) * (out_max - out_min) / (in_max - in_min) + out_min
 
 
+def rgb_to_hsv_np(rgb: np.ndarray) -> np.ndarray:
+    """
+    Vectorized equivalent of colorsys.rgb_to_hsv for an (..., 3) float array of components on [0, 1].
+    """
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    maxc = np.max(rgb, axis=-1)
+    minc = np.min(rgb, axis=-1)
+    delta = maxc - minc
+    safe_max = np.where(maxc == 0, 1, maxc)
+    safe_delta = np.where(delta == 0, 1, delta)
+    s = np.where(maxc == 0, 0.0, delta / safe_max)
+    rc = (maxc - r) / safe_delta
+    gc = (maxc - g) / safe_delta
+    bc = (maxc - b) / safe_delta
+    h = np.select([maxc == r, maxc == g], [bc - gc, 2.0 + rc - bc], default=4.0 + gc - rc)
+    h = np.where(delta == 0, 0.0, (h / 6.0) % 1.0)
+    return np.stack([h, s, maxc], axis=-1)
+
+
+def hsv_to_rgb_np(hsv: np.ndarray) -> np.ndarray:
+    """
+    Vectorized equivalent of colorsys.hsv_to_rgb for an (..., 3) float array, using the usual hue sector math with
+    np.choose instead of per-point branches.
+    """
+    h, s, v = hsv[..., 0], hsv[..., 1], hsv[..., 2]
+    i = (h * 6.0).astype(np.int64)
+    f = h * 6.0 - i
+    p = v * (1.0 - s)
+    q = v * (1.0 - s * f)
+    t = v * (1.0 - s * (1.0 - f))
+    i %= 6
+    r = np.choose(i, [v, q, p, p, t, v])
+    g = np.choose(i, [t, v, v, q, p, p])
+    b = np.choose(i, [p, p, t, v, v, q])
+    return np.stack([r, g, b], axis=-1)
+
+
 def str_key_to_tuple(key_name: str, row_major: bool = False) -> Tuple[int, int]:
     """
     Converts a str key name to the tuple corresponding to its position, determined by row_major.
     """
     if row_major:
-        grid = key_grid_by_row
-    else:
-        grid = key_grid_by_col
-    for sub, i in zip(grid, range(len(grid))):
-        for known, j in zip(sub, range(len(sub))):
-            if key_name == known:
-                return i, j
-    return -1, -1
+        return _name_to_rc.get(key_name, (-1, -1))
+    return _name_to_cr.get(key_name, (-1, -1))
 
 
 def tuple_key_to_string(key_coordinate: Tuple[int, int], row_major: bool = False) -> str:
@@ -117,21 +170,33 @@ class Mask(Enum):
     """
     Masks are used to filter which keys are used for an operation. Adding Masks creates a Union of the two. Subtracting
     a Mask from a Mask removes the Intersection between the two from the first Mask. Lists of strings can also be added
-    and subtracted from Masks.
+    and subtracted from Masks. Both operations return a plain list of key names, which downstream code accepts
+    anywhere a Mask is.
     """
-    ALL = list(filter(lambda x: x is not None, flatten(key_grid_by_row)))
+    ALL = (_ALL_KEYS,)
     WASD = ["W", "A", "S", "D"]
     FUNCTION = ["F1", "F2", "F3", "F4", "F5", "F6", "F7", "F8", "F9", "F10", "F11", "F12"]
     NUMPAD = ["N0", "N1", "N2", "N3", "N4", "N5", "N6", "N7", "N8", "N9", "Divide", "Multiply", "NumLock", "NDelete",
               "Subtract", "Add", "RightEnter"]
 
-    def __new__(cls, keys: List[str], *args, **kwargs):
-        assert isinstance(keys, list)
-        keys = list(filter(lambda x: x is not None, keys))
-        if len(keys) > 0:
-            assert isinstance(keys[0], str)
+    def __new__(cls, keys: Union[List[str], Tuple[str, ...]], *args, **kwargs):
+        if type(keys) is tuple:
+            # Tuples (like _ALL_KEYS) are already filtered; skip the None scan.
+            keys = list(keys)
+        else:
+            assert isinstance(keys, list)
+            keys = [sys.intern(key) for key in keys if key is not None]
+            if len(keys) > 0:
+                assert isinstance(keys[0], str)
         obj = object.__new__(cls)
-        obj._value = keys
+        obj._value_ = keys
+        obj._set = frozenset(keys)
+        obj._bool = np.array([[key in obj._set for key in sub] for sub in key_grid_by_col], dtype=bool)
+        # Fancy-index arrays into a (cols, rows, ...) frame: frame.buf[mask._cols, mask._rows] touches exactly the
+        # masked keys in one indexed NumPy op.
+        positions = [_name_to_cr[key] for key in keys if key in _name_to_cr]
+        obj._cols = np.array([position[0] for position in positions], dtype=np.intp)
+        obj._rows = np.array([position[1] for position in positions], dtype=np.intp)
         return obj
 
     def __add__(self, other):
@@ -144,27 +209,28 @@ class Mask(Enum):
     def __sub__(self, other):
         if not (isinstance(other, Mask) or isinstance(other, list)):
             return NotImplemented
-        out: list = self.value
         if isinstance(other, Mask):
             other = other.value
-        for key in other:
-            if key in out:
-                out.remove(key)
-        return Mask(out)
+        other = set(other)
+        return [key for key in self.value if key not in other]
 
     def __radd__(self, other):
         if not (isinstance(other, Mask) or isinstance(other, list)):
             return NotImplemented
-        return self + Mask(other)
+        return other + self.value
 
     def __rsub__(self, other):
         if not (isinstance(other, Mask) or isinstance(other, list)):
             return NotImplemented
-        return Mask(other) - self
+        mine = set(self.value)
+        return [key for key in other if key not in mine]
 
     def __iter__(self):
         return iter(self.value)
 
+    def __contains__(self, item):
+        return item in self._set
+
     def __getitem__(self, item):
         return self.value[item]
 
@@ -172,6 +238,19 @@ class Mask(Enum):
         return len(self.value)
 
 
+# Saturating clamp lookup covering components on [-256, 767], so scalar Color construction avoids a np.clip call.
+_CLAMP_LUT = tuple(min(max(i - 256, 0), 255) for i in range(1024))
+
+
+def _clamp_scalar(x: int) -> int:
+    """
+    Clamps a single color component on [0, 255] through the lookup table when it's in range.
+    """
+    if -256 <= x <= 767:
+        return _CLAMP_LUT[x + 256]
+    return min(max(x, 0), 255)
+
+
 class Color:
     """
     A Color supports a few basic mathematical operations:
@@ -182,29 +261,67 @@ class Color:
         ~Color        : Color(255, 255, 255) - Color
         Color * float : by-part scaling
     Every operation clamps the output Color components on [0, 255].
+
+    The components are stored in a length-3 int16 ndarray (self.v), so arithmetic and clamping run as single NumPy
+    ops instead of per-component Python math. The int16 dtype leaves headroom for intermediate values outside
+    [0, 255] before clamping. r, g, and b remain accessible as properties.
     """
 
+    __slots__ = ('v',)
+
     def __init__(self, r: int, g: int, b: int):
-        self.r = r
-        self.g = g
-        self.b = b
-        self.clamp()
+        try:
+            self.v = np.array([_clamp_scalar(r), _clamp_scalar(g), _clamp_scalar(b)], dtype=np.int16)
+        except TypeError:
+            # Non-integer components can't index the clamp table; fall back to the array clamp.
+            self.v = np.array([r, g, b], dtype=np.int16)
+            self.clamp()
+
+    @classmethod
+    def from_array(cls, v):
+        """
+        Builds a Color directly from a length-3 array, skipping the clamp. Only use this when the values are already
+        known to be on [0, 255] (e.g. the output of a clipped NumPy op).
+        """
+        obj = cls.__new__(cls)
+        obj.v = np.asarray(v, dtype=np.int16)
+        return obj
+
+    @property
+    def r(self) -> int:
+        return int(self.v[0])
+
+    @r.setter
+    def r(self, value):
+        self.v[0] = value
+
+    @property
+    def g(self) -> int:
+        return int(self.v[1])
+
+    @g.setter
+    def g(self, value):
+        self.v[1] = value
+
+    @property
+    def b(self) -> int:
+        return int(self.v[2])
+
+    @b.setter
+    def b(self, value):
+        self.v[2] = value
 
     def clamp(self) -> None:
         """
         Clamps the components of this Color on [0, 255].
         """
-        self.r = min(max(self.r, 0), 255)
-        self.g = min(max(self.g, 0), 255)
-        self.b = min(max(self.b, 0), 255)
+        np.clip(self.v, 0, 255, out=self.v)
 
     def is_zero(self) -> bool:
         """
         :return: True if all of this Color's components are 0.
         """
-        if self.r == 0 and self.g == 0 and self.b == 0:
-            return True
-        return False
+        return not self.v.any()
 
     def zero_out(self) -> None:
         """
@@ -216,25 +333,22 @@ class Color:
         """
         Sets all three components of this Color to the corresponding components of another Color.
         """
-        self.set_color_values(color.r, color.g, color.b)
+        self.v[:] = color.v
 
     def set_color_values(self, r, g, b) -> None:
         """
         Sets the r, g, and b components of this Color individually.
         """
-        self.r = r
-        self.g = g
-        self.b = b
+        self.v[0] = r
+        self.v[1] = g
+        self.v[2] = b
         self.clamp()
 
     def scale(self, scale_value: float) -> None:
         """
         Scale the r, g, and b values of this Color object.
         """
-        self.r = int(round(self.r * scale_value))
-        self.g = int(round(self.g * scale_value))
-        self.b = int(round(self.b * scale_value))
-        self.clamp()
+        self.v[:] = np.clip(np.rint(self.v * scale_value), 0, 255)
 
     @staticmethod
     def to_hsv(rgb) -> Tuple[float, float, float]:
@@ -273,21 +387,21 @@ class Color:
 
     def __add__(self, other):
         if isinstance(other, Color):
-            return Color(self.r + other.r, self.g + other.g, self.b + other.b)
-        return Color(self.r + other, self.g + other, self.b + other)
+            other = other.v
+        return Color.from_array(np.clip(self.v + other, 0, 255))
 
     def __sub__(self, other):
         if isinstance(other, Color):
-            return Color(self.r - other.r, self.g - other.g, self.b - other.b)
-        return Color(self.r - other, self.g - other, self.b - other)
+            other = other.v
+        return Color.from_array(np.clip(self.v - other, 0, 255))
 
     def __mul__(self, other):
         if not (isinstance(other, int) or isinstance(other, float)):
             return NotImplemented
-        return Color(int(self.r * other), int(self.g * other), int(self.b * other))
+        return Color.from_array(np.clip((self.v * other).astype(np.int16), 0, 255))
 
     def __rsub__(self, other):
-        return Color(other - self.r, other - self.g, other - self.b)
+        return Color.from_array(np.clip(other - self.v, 0, 255))
 
     def __radd__(self, other):
         return self + other
@@ -301,7 +415,7 @@ class Color:
     def __eq__(self, other):
         if not isinstance(other, Color):
             return NotImplemented
-        return self.r == other.r and self.g == other.g and self.b == other.b
+        return np.array_equal(self.v, other.v)
 
     def __ne__(self, other):
         if not isinstance(other, Color):
@@ -321,13 +435,70 @@ class Color:
         return tuple(self)[item]
 
 
+class ColorFrame:
+    """
+    A ColorFrame holds the Colors for a full grid of keys in a single (rows, cols, 3) int16 ndarray instead of one
+    Color object per key. Keeping a frame contiguous lets whole-keyboard operations, like combining LightingScheme
+    layers, run as single NumPy ops rather than Python loops over Color objects.
+    """
+
+    def __init__(self, shape: Tuple[int, int] = None):
+        if shape is None:
+            shape = (len(key_grid_by_col), len(key_grid_by_col[0]))
+        self.buf = np.zeros(shape + (3,), dtype=np.int16)
+        self._all = np.ones(shape, dtype=bool)
+
+    def set_color(self, position: Tuple[int, int], color: Color) -> None:
+        """
+        Sets the components at a grid position from a Color.
+        """
+        self.buf[position[0], position[1]] = color.v
+
+    def get_color(self, position: Tuple[int, int]) -> Color:
+        """
+        Gets the Color at a grid position. The Color shares memory with this frame's buffer.
+        """
+        return Color.from_array(self.buf[position[0], position[1]])
+
+    def zero_out(self) -> None:
+        """
+        Sets every component in this frame to 0.
+        """
+        self.buf[:] = 0
+
+    def to_report_bytes(self, order, header: bytes = b"") -> bytes:
+        """
+        Packs this frame into a flat outgoing report payload. order is a precomputed index array that maps report
+        slots onto rows of the flattened (N, 3) view of this frame, so vendor-specific key ordering stays with the
+        keyboard definition that builds it. The pack is a single gather plus tobytes, with no per-key iteration.
+        """
+        flat = self.buf.reshape(-1, 3).astype(np.uint8)
+        return header + flat[order].tobytes()
+
+    def combine(self, other, combine_type: CombineType, where: np.ndarray = None) -> None:
+        """
+        Combines another ColorFrame onto this one, in place, according to a CombineType. The semantics match
+        CombiningScheme: Overlay only replaces positions where the other frame is non-zero, while Add and Subtract
+        clamp on [0, 255]. An optional boolean (rows, cols) array limits which positions are affected.
+
+        The actual kernel lives in lighting._combine, which compiles it with Numba when available.
+        """
+        if where is None:
+            where = self._all
+        combine_frames(self.buf, other.buf, where, combine_type.value)
+
+
 class GradientKeyPoint:
+    __slots__ = ('color', 't', 'hsv')
+
     def __init__(self, color: Color, t: float):
         """
-        A GradientKeyPoint is used by a Gradient to set the key interpolation points.
+        A GradientKeyPoint is used by a Gradient to set the key interpolation points. The HSV equivalent of the color
+        is computed once here so HSV interpolation doesn't have to re-convert it on every lookup.
         """
         self.color = color
         self.t = t
+        self.hsv = Color.to_hsv(color)
 
 
 class Gradient:
@@ -342,22 +513,58 @@ class Gradient:
         assert self.key_points[-1].t > self.key_points[0].t
         self.on_hsv = on_hsv
 
+        self._ts = np.array([point.t for point in self.key_points])
+        self._rgb = np.array([tuple(point.color) for point in self.key_points], dtype=np.float64)
+        self._hsv = np.array([point.hsv for point in self.key_points], dtype=np.float64)
+
+        # Memoized per instance (a class-level lru_cache would keep every Gradient alive forever). Key points never
+        # change after construction, so a repeated t always maps to the same Color.
+        self.get_color = lru_cache(maxsize=1024)(self.get_color)
+        self._luts = {}
+
+    def build_lut(self, n: int) -> np.ndarray:
+        """
+        Builds an (n, 3) uint8 table of evenly spaced Colors across this Gradient, cached per size. Callers that
+        evaluate a fixed number of points (like column gradients) can index this instead of interpolating each time.
+        """
+        lut = self._luts.get(n)
+        if lut is None:
+            lut = self.get_colors(np.linspace(self.key_points[0].t, self.key_points[-1].t, n))
+            self._luts[n] = lut
+        return lut
+
     def get_color(self, t: float) -> Color:
         """
         Gets the Color at some point t on this Gradient.
         """
-        i = 1
-        prev_point = self.key_points[0]
-        next_point = self.key_points[1]
-        while t <= self.key_points[-1].t:
-            if prev_point.t <= t <= next_point.t:
-                break
-            i += 1
-            prev_point = next_point
-            next_point = self.key_points[i]
+        i = min(max(int(np.searchsorted(self._ts, t)), 1), len(self.key_points) - 1)
+        prev_point = self.key_points[i - 1]
+        next_point = self.key_points[i]
 
         interp_t = (t - prev_point.t) / (next_point.t - prev_point.t)
-        return Color.interpolate(prev_point.color, next_point.color, interp_t, self.on_hsv)
+        if self.on_hsv:
+            return Color.from_hsv((interpolate_single(prev_point.hsv[0], next_point.hsv[0], interp_t),
+                                   interpolate_single(prev_point.hsv[1], next_point.hsv[1], interp_t),
+                                   interpolate_single(prev_point.hsv[2], next_point.hsv[2], interp_t)))
+        return Color.interpolate(prev_point.color, next_point.color, interp_t)
+
+    def get_colors(self, ts) -> np.ndarray:
+        """
+        Gets the Colors for a whole array of points on this Gradient at once, as an (N, 3) uint8 ndarray. The segment
+        for every t is found with one searchsorted call and both interpolation spaces run as array math, so this is
+        the preferred way to evaluate a Gradient across a grid of keys.
+        """
+        ts = np.asarray(ts, dtype=np.float64)
+        i = np.clip(np.searchsorted(self._ts, ts), 1, len(self._ts) - 1)
+        prev_t = self._ts[i - 1]
+        next_t = self._ts[i]
+        interp_t = ((ts - prev_t) / (next_t - prev_t))[..., None]
+        if self.on_hsv:
+            hsv = (1 - interp_t) * self._hsv[i - 1] + interp_t * self._hsv[i]
+            rgb = hsv_to_rgb_np(hsv) * 255
+        else:
+            rgb = (1 - interp_t) * self._rgb[i - 1] + interp_t * self._rgb[i]
+        return np.clip(rgb, 0, 255).astype(np.uint8)
 
     def size(self) -> float:
         """
@@ -370,32 +577,37 @@ class Gradient:
 
 
 class KeyIndex:
+    __slots__ = ('index', 'row_major', '_name', '_position')
+
     def __init__(self, index: Union[str, Tuple[int, int]], row_major: bool):
         """
-        A KeyIndex allows for easy passing between str and position definitions for keys.
+        A KeyIndex allows for easy passing between str and position definitions for keys. Both representations are
+        resolved once at construction, so comparisons, hashing, and position lookups never touch the grids again.
         :param index: either the key name or its position
         :param row_major: if the position definition is in row_major space
         """
         self.index = index
         self.row_major = row_major
+        if isinstance(index, str):
+            self._name = index
+            self._position = str_key_to_tuple(index, row_major)
+        else:
+            self._name = tuple_key_to_string(index, row_major)
+            self._position = index
 
     def __str__(self):
-        if isinstance(self.index, str):
-            return self.index
-
-        return tuple_key_to_string(self.index, self.row_major)
+        return self._name
 
     def __iter__(self):
-        if isinstance(self.index, tuple):
-            return self.index
-
-        return iter(str_key_to_tuple(self.index, self.row_major))
+        return iter(self._position)
 
     def __getitem__(self, item):
-        return tuple(self)[item]
+        return self._position[item]
 
     def __eq__(self, other):
-        return str(self) == str(other)
+        if isinstance(other, KeyIndex):
+            return self._name == other._name
+        return self._name == str(other)
 
     def __hash__(self):
-        return hash((self.index, self.row_major))
+        return hash(self._name)